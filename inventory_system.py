@@ -5,40 +5,235 @@ A simple inventory management system module.
 
 This module allows for adding, removing, and querying item quantities in an
 in-memory stock inventory. It also supports saving the inventory to and
-loading it from a JSON file.
+loading it from a JSON file, or a MessagePack file for compact binary
+checkpoints.
 """
 
+import contextlib
 import json
+import logging
+import math
+import mmap
+import operator
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; used to vectorize scans
+    np = None
 
-def add_item(stock_data, item="default", qty=0, logs=None):
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder/decoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # only needed for .msgpack files
+    msgpack = None
+
+_log = logging.getLogger(__name__)
+
+# Files smaller than this are read directly; mapping them costs more
+# than the copy it saves.
+MMAP_MIN_SIZE = 64 * 1024
+
+# Encoded inventories at least this large are written in the background;
+# smaller writes finish faster than a thread hand-off.
+ASYNC_SAVE_MIN_SIZE = 64 * 1024
+
+
+# The range of quantities an Inventory can store in its array('q') column
+_QTY_MIN, _QTY_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _intern_name(name):
+    """Interns name if it is an exact str; sys.intern rejects subclasses."""
+    return sys.intern(name) if name.__class__ is str else name
+
+
+def _is_msgpack(file):
+    """Tells whether file should be stored as MessagePack rather than JSON."""
+    return os.path.splitext(file)[1] == ".msgpack"
+
+
+def _require_msgpack():
+    """Raises ImportError if msgpack is not installed."""
+    if msgpack is None:
+        raise ImportError("msgpack is required for .msgpack files.")
+
+
+def _dumps(stock_data, file, pretty=False):
+    """
+    Encodes the inventory as bytes in the format implied by file.
+
+    JSON is written compactly unless pretty is set; MessagePack ignores it.
+    """
+    if _is_msgpack(file):
+        _require_msgpack()
+        return msgpack.packb(stock_data, use_bin_type=True)
+    if orjson is not None:
+        # orjson rejects integers beyond 64 bits; the stdlib encodes them
+        with contextlib.suppress(orjson.JSONEncodeError):
+            if pretty:
+                return orjson.dumps(stock_data, option=orjson.OPT_INDENT_2)
+            return orjson.dumps(stock_data)
+    if pretty:
+        return json.dumps(stock_data, indent=4).encode("utf-8")
+    return json.dumps(stock_data, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data, file):
+    """Decodes bytes in the format implied by file into a Python object."""
+    if _is_msgpack(file):
+        _require_msgpack()
+        return msgpack.unpackb(data, raw=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# pylint: disable-next=too-many-arguments
+def add_item(stock_data, item="default", qty=0, logs=None, *,
+             _isinstance=isinstance, _intern=sys.intern, _time=time.time):
     """
     Adds a specified quantity of an item to the stock.
 
+    The keyword-only, underscore-prefixed parameters bind hot globals as
+    fast locals; callers should never pass them.
+
     Args:
         stock_data (dict): The inventory dictionary.
         item (str): The name of the item to add.
         qty (int or float): The quantity to add.
-        logs (list, optional): A list to append log messages to.
-                               Defaults to None.
+        logs (list, optional): A list to append log records to. Records
+                               are (timestamp, qty, item) tuples; format
+                               them with flush_logs(). Defaults to None.
     """
     if logs is None:
         logs = []
 
     # Basic input validation
-    if not isinstance(item, str) or not item:
-        print(f"Error: Item name '{item}' is not a valid string.")
+    if not _isinstance(item, str) or not item:
+        _log.error("Item name %r is not a valid string.", item)
         return
-    if not isinstance(qty, (int, float)):
-        print(f"Error: Quantity '{qty}' for item '{item}' is not a number.")
+
+    # Interned keys let later dict lookups match on identity; sys.intern
+    # only takes exact str, not subclasses
+    if item.__class__ is str:
+        item = _intern(item)
+    # Non-numeric quantities are rejected by the arithmetic itself; a
+    # ValueError comes from array-like quantities in the comparison
+    try:
+        if qty < 0:
+            _log.warning("Adding negative quantity (%s) for %r.", qty, item)
+        stock_data[item] = stock_data.get(item, 0) + qty
+    except (TypeError, ValueError):
+        _log.error("Quantity %r for item %r is not a number.", qty, item)
         return
-    if qty < 0:
-        print(f"Warning: Adding negative quantity ({qty}) for '{item}'.")
+    # Store a raw record; formatting is deferred to flush_logs()
+    logs.append((_time(), qty, item))
+
+
+def add_item_fast(stock_data, item, qty):
+    """
+    Adds a quantity of an item to the stock without any validation.
+
+    Only use this for trusted input, such as data that has already been
+    validated or replayed from a log; otherwise use add_item().
 
+    Args:
+        stock_data (dict): The inventory dictionary.
+        item (str): The name of the item to add.
+        qty (int or float): The quantity to add.
+    """
     stock_data[item] = stock_data.get(item, 0) + qty
-    # Use modern f-string for formatting
-    logs.append(f"{str(datetime.now())}: Added {qty} of {item}")
+
+
+def flush_logs(logs):
+    """
+    Formats raw log records into a human-readable log.
+
+    Args:
+        logs (list): A list of (timestamp, qty, item) records.
+
+    Returns:
+        str: The formatted log messages, one per line, in the same order.
+    """
+    lines = []
+    last_sec = None
+    stamp = ""
+    for t, q, n in logs:
+        # Split the same way datetime.fromtimestamp() does
+        frac, whole = math.modf(t)
+        sec, usec = int(whole), round(frac * 1e6)
+        if usec >= 1000000:
+            sec, usec = sec + 1, usec - 1000000
+        if sec != last_sec:
+            # Only build a datetime once per second of records
+            last_sec, stamp = sec, str(datetime.fromtimestamp(sec))
+        if usec:
+            lines.append(f"{stamp}.{usec:06d}: Added {q} of {n}")
+        else:
+            lines.append(f"{stamp}: Added {q} of {n}")
+    return "\n".join(lines)
+
+
+def bulk_add(stock_data, names, qtys, logs=None):
+    """
+    Adds quantities for many items in a single call.
+
+    The whole batch is validated once up front instead of item by item;
+    if any entry is invalid, nothing is added.
+
+    Args:
+        stock_data (dict or Inventory): The inventory to add to.
+        names (list): The item names, one per quantity.
+        qtys (list or np.ndarray): The quantities to add. An Inventory
+                                   only accepts integers.
+        logs (list, optional): A list to append log records to, as in
+                               add_item(). Defaults to None.
+    """
+    if logs is None:
+        logs = []
+
+    if len(names) != len(qtys):
+        _log.error("Got %d item names but %d quantities.",
+                   len(names), len(qtys))
+        return
+    if not all(isinstance(item, str) and item for item in names):
+        _log.error("Item names must all be non-empty strings.")
+        return
+    is_inventory = isinstance(stock_data, Inventory)
+    if np is not None and isinstance(qtys, np.ndarray):
+        valid = qtys.dtype.kind in ("iu" if is_inventory else "iuf")
+    else:
+        types = int if is_inventory else (int, float)
+        valid = all(isinstance(qty, types) for qty in qtys)
+    if not valid:
+        _log.error("Quantities must all be %s.",
+                   "integers" if is_inventory else "numbers")
+        return
+
+    if is_inventory:
+        try:
+            stock_data.bulk_add(names, qtys)
+        except OverflowError:
+            _log.error("Quantity totals must all fit in 64 bits.")
+            return
+    else:
+        if np is not None and isinstance(qtys, np.ndarray):
+            qtys = qtys.tolist()
+        for item, qty in zip(names, qtys):
+            item = _intern_name(item)
+            stock_data[item] = stock_data.get(item, 0) + qty
+    now = time.time()
+    logs.extend([(now, qty, item) for item, qty in zip(names, qtys)])
 
 
 def remove_item(stock_data, item, qty):
@@ -54,17 +249,17 @@ def remove_item(stock_data, item, qty):
         qty (int or float): The quantity to remove.
     """
     try:
-        if item in stock_data:
-            stock_data[item] -= qty
-            if stock_data[item] <= 0:
-                del stock_data[item]
-        else:
-            print(f"Info: Item '{item}' not in stock, cannot remove.")
+        new_qty = stock_data[item] - qty
     except KeyError:
-        # This can happen if the item was removed by another process
-        print(f"Warning: Could not remove '{item}', it was not found.")
+        _log.info("Item %r not in stock, cannot remove.", item)
+        return
     except TypeError:
-        print(f"Error: Invalid quantity '{qty}' for item '{item}'.")
+        _log.error("Invalid quantity %r for item %r.", qty, item)
+        return
+    if new_qty <= 0:
+        del stock_data[item]
+    else:
+        stock_data[item] = new_qty
 
 
 def get_qty(stock_data, item):
@@ -81,42 +276,145 @@ def get_qty(stock_data, item):
     return stock_data.get(item, 0)
 
 
-def load_data(stock_data, file="inventory.json"):
+def load_data(file="inventory.json"):
     """
-    Loads the inventory from a JSON file, updating the stock_data dict.
+    Loads the inventory from a JSON or, for a .msgpack file, MessagePack
+    file.
+
+    Item names are interned as they are loaded, so lookups with names
+    interned by add_item() compare by identity.
 
     Args:
-        stock_data (dict): The inventory dictionary to update.
         file (str): The name of the file to load from.
+
+    Returns:
+        dict: The loaded inventory, or an empty dict if it could not be
+              loaded.
     """
+    _writer.flush()  # Don't read past a save that is still in flight
+    # The stdlib json decoder cannot parse from a buffer without a copy
+    mappable = orjson is not None or _is_msgpack(file)
     try:
-        with open(file, "r", encoding="utf-8") as f:
-            data = json.loads(f.read())
-            stock_data.clear()  # Clear existing data
-            stock_data.update(data)  # Load new data
+        with open(file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if mappable and size >= MMAP_MIN_SIZE:
+                # Parse straight out of the page cache, without a bytes copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        data = _loads(view, file)
+            else:
+                data = _loads(f.read(), file)
+            if not isinstance(data, dict) or not all(
+                    isinstance(k, str) for k in data):
+                raise ValueError(f"{file} does not map names to quantities")
+            data = {_intern_name(k): v for k, v in data.items()}
             print(f"Data loaded from {file}.")
+            return data
     except FileNotFoundError:
-        print(f"Warning: {file} not found. Starting with an empty inventory.")
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file}.")
+        _log.warning("%s not found. Starting with an empty inventory.", file)
+    except ValueError:  # JSONDecodeError and msgpack's errors alike
+        _log.error("Could not decode data from %s.", file)
+    except (IOError, ImportError) as e:
+        _log.error("Error loading file %s: %s", file, e)
+    return {}
+
+
+def _write_file(file, payload):
+    """
+    Writes an encoded inventory to disk, reporting the outcome.
+
+    The payload goes to a temporary file that then replaces file, so a
+    reader never sees a half-written inventory.
+
+    Args:
+        file (str): The name of the file to save to.
+        payload (bytes): The encoded inventory.
+    """
+    tmp = f"{file}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, file)
+        print(f"Data saved to {file}.")
     except IOError as e:
-        print(f"Error loading file {file}: {e}")
+        _log.error("Error saving file %s: %s", file, e)
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+
+
+class _AsyncWriter:
+    """
+    Writes encoded inventories on a single background thread.
+
+    At most one write is in flight: submitting a new one first waits for
+    the previous one, so saves always land on disk in call order.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._pending = None
+
+    def submit(self, file, payload):
+        """Queues a write and returns without waiting for it."""
+        self.flush()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="inventory-save")
+        self._pending = self._executor.submit(_write_file, file, payload)
+
+    def flush(self):
+        """Waits for the in-flight write, if any, to complete."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending.result()
 
 
-def save_data(stock_data, file="inventory.json"):
+_writer = _AsyncWriter()
+
+
+def save_data(stock_data, file="inventory.json", pretty=False):
     """
-    Saves the current inventory to a JSON file.
+    Saves the current inventory to a JSON or, for a .msgpack file,
+    MessagePack file.
+
+    The inventory is encoded immediately, so later changes to stock_data
+    are not saved. Large inventories are then written in the background;
+    call flush_saves() to wait for the write to complete.
 
     Args:
         stock_data (dict): The inventory dictionary to save.
         file (str): The name of the file to save to.
+        pretty (bool): Whether to indent JSON output for reading by
+                       humans. Defaults to compact output.
     """
     try:
-        with open(file, "w", encoding="utf-8") as f:
-            f.write(json.dumps(stock_data, indent=4))
-            print(f"Data saved to {file}.")
-    except IOError as e:
-        print(f"Error saving file {file}: {e}")
+        payload = _dumps(stock_data, file, pretty)
+    except ImportError as e:
+        _log.error("Error saving file %s: %s", file, e)
+        return
+    if len(payload) >= ASYNC_SAVE_MIN_SIZE:
+        _writer.submit(file, payload)
+    else:
+        _writer.flush()  # Don't let an older background save land last
+        _write_file(file, payload)
+
+
+def save_data_pretty(stock_data, file="inventory.json"):
+    """
+    Saves the current inventory to an indented, human-readable JSON file.
+
+    Args:
+        stock_data (dict): The inventory dictionary to save.
+        file (str): The name of the file to save to.
+    """
+    save_data(stock_data, file, pretty=True)
+
+
+def flush_saves():
+    """
+    Waits for any background save started by save_data() to complete.
+    """
+    _writer.flush()
 
 
 def print_data(stock_data):
@@ -139,6 +437,10 @@ def check_low_items(stock_data, threshold=5):
     """
     Finds all items with a quantity below the threshold.
 
+    This is a linear scan of the dict. For large inventories that are
+    queried often, use Inventory, whose scan is vectorized and which
+    answers its low_threshold query from an index.
+
     Args:
         stock_data (dict): The inventory dictionary.
         threshold (int): The quantity threshold.
@@ -149,15 +451,186 @@ def check_low_items(stock_data, threshold=5):
     return [item for item, qty in stock_data.items() if qty < threshold]
 
 
+class Inventory:
+    """
+    A columnar (structure-of-arrays) inventory for large numbers of items.
+
+    Item names are kept in a list and integer quantities in a parallel,
+    contiguous array.array('q') (8 bytes per entry), with a dict mapping
+    each name to its row. When NumPy is installed, check_low_items()
+    compares the whole quantity column in one vectorized operation.
+
+    The set of items below low_threshold is also kept up to date on every
+    change, so check_low_items() at that threshold costs O(k) in the
+    number of low items rather than a scan of the whole inventory.
+    """
+
+    __slots__ = ("names", "index", "qty", "_low_threshold", "_low")
+
+    def __init__(self, low_threshold=5):
+        self.names = []
+        self.index = {}
+        self.qty = array("q")
+        self._low_threshold = low_threshold
+        self._low = set()
+
+    @property
+    def low_threshold(self):
+        """int: The threshold the low set is kept for; fixed at creation."""
+        return self._low_threshold
+
+    def add_item(self, item, qty):
+        """
+        Adds a specified quantity of an item, creating its row if needed.
+
+        Args:
+            item (str): The name of the item to add.
+            qty (int): The quantity to add.
+        """
+        if not isinstance(item, str) or not item:
+            _log.error("Item name %r is not a valid string.", item)
+            return
+        i = self.index.get(item)
+        try:
+            if i is None:
+                # The quantity column rejects a bad qty before any other
+                # part of the row is created
+                self.qty.append(qty)
+                item = _intern_name(item)
+                self.index[item] = len(self.names)
+                self.names.append(item)
+                new_qty = qty
+            else:
+                new_qty = self.qty[i] + qty
+                self.qty[i] = new_qty
+        except (TypeError, OverflowError):
+            _log.error("Quantity %r for item %r is not a 64-bit integer.",
+                       qty, item)
+            return
+        self._update_low(item, new_qty)
+
+    def bulk_add(self, names, qtys):
+        """
+        Adds quantities for many items at once.
+
+        The new totals are computed and range-checked before anything is
+        written, so a batch that fails leaves the inventory unchanged.
+        Repeated names accumulate correctly.
+
+        Args:
+            names (list): The item names, one per quantity.
+            qtys (list or np.ndarray): The integer quantities to add.
+
+        Raises:
+            TypeError: If a quantity is not an integer.
+            OverflowError: If a new total does not fit in 64 bits.
+        """
+        totals = {}
+        for item, qty in zip(names, qtys):
+            total = totals[item] if item in totals else self.get_qty(item)
+            totals[item] = total + operator.index(qty)
+        if not all(_QTY_MIN <= total <= _QTY_MAX for total in totals.values()):
+            raise OverflowError("quantity total does not fit in 64 bits")
+        for item, total in totals.items():
+            self.qty[self._row(item)] = total
+            self._update_low(item, total)
+
+    def _row(self, item):
+        """Returns the row index of item, appending a new row if needed."""
+        i = self.index.get(item)
+        if i is None:
+            item = _intern_name(item)
+            i = len(self.names)
+            self.index[item] = i
+            self.names.append(item)
+            self.qty.append(0)
+        return i
+
+    def remove_item(self, item, qty):
+        """
+        Removes a specified quantity of an item.
+
+        If the quantity drops to 0 or below, the item's row is removed by
+        moving the last row into its place.
+
+        Args:
+            item (str): The name of the item to remove.
+            qty (int): The quantity to remove.
+        """
+        i = self.index.get(item)
+        if i is None:
+            _log.info("Item %r not in stock, cannot remove.", item)
+            return
+        try:
+            new_qty = self.qty[i] - operator.index(qty)
+            if new_qty > 0:
+                self.qty[i] = new_qty
+        except (TypeError, OverflowError):
+            _log.error("Invalid quantity %r for item %r.", qty, item)
+            return
+        if new_qty > 0:
+            self._update_low(item, new_qty)
+        else:
+            last_item = self.names.pop()
+            last_qty = self.qty.pop()
+            if last_item != item:
+                self.names[i] = last_item
+                self.index[last_item] = i
+                self.qty[i] = last_qty
+            del self.index[item]
+            self._low.discard(item)
+
+    def _update_low(self, item, qty):
+        """Records whether item is currently below low_threshold."""
+        if qty < self._low_threshold:
+            self._low.add(item)
+        else:
+            self._low.discard(item)
+
+    def get_qty(self, item):
+        """
+        Gets the current quantity of a specific item.
+
+        Args:
+            item (str): The name of the item to query.
+
+        Returns:
+            int: The quantity of the item, or 0 if not found.
+        """
+        i = self.index.get(item)
+        return 0 if i is None else self.qty[i]
+
+    def check_low_items(self, threshold=None):
+        """
+        Finds all items with a quantity below the threshold.
+
+        At low_threshold the answer comes from the maintained low set, in
+        no particular order; any other threshold scans the quantity column.
+
+        Args:
+            threshold (int, optional): The quantity threshold. Defaults to
+                                       low_threshold.
+
+        Returns:
+            list: A list of item names below the threshold.
+        """
+        if threshold is None or threshold == self._low_threshold:
+            return list(self._low)
+        if np is None or not self.names:
+            return [n for n, q in zip(self.names, self.qty) if q < threshold]
+        # Zero-copy view of the quantity column
+        mask = np.frombuffer(self.qty, dtype=np.int64) < threshold
+        return [self.names[i] for i in np.flatnonzero(mask)]
+
+
 def main():
     """
     Main function to run the inventory management simulation.
     """
-    stock_data = {}  # Initialize a local dictionary
-    logs = []        # Initialize a local log list
+    logs = []  # Initialize a local log list
 
     # Load initial data (if any)
-    load_data(stock_data)
+    stock_data = load_data()
 
     # Perform operations, passing the state
     add_item(stock_data, "apple", 10, logs)
@@ -177,12 +650,15 @@ def main():
 
     print_data(stock_data)
     save_data(stock_data)
+    flush_saves()
 
     print("\nLogs:")
-    for log_entry in logs:
-        print(log_entry)
+    # One write call, so the whole log goes out in a single flush
+    sys.stdout.write(flush_logs(logs) + "\n")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(levelname)s: %(message)s")
     main()
 